@@ -4,13 +4,14 @@ from __future__ import annotations
 import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"  # removes the warning
 
-import argparse, json, re, subprocess
+import argparse, json, re
 from typing import Dict, Any
 
 def _contains_whole_word(s: str, w: str) -> bool:
     return re.search(rf"(?i)\b{re.escape(w)}\b", s) is not None
 
 from app.core.llm import call_llm
+from app.core.lifecycle import get_manager
 from app.core.rag import ask_with_rag_def
 
 DEFAULT_MODEL = "qwen2.5:3b-instruct"  # lighter and more stable for 8 GB
@@ -67,8 +68,8 @@ def _test_rag_availability():
     """Test if RAG functionality is available and working."""
     try:
         # Try to import and load the basic RAG components
-        from app.core.rag import _load_df, _load_index
-        _load_df()
+        from app.core.rag import _load_corpus, _load_index
+        _load_corpus()
         _load_index()
         # Don't test the embedder as it causes segmentation faults
         return True
@@ -84,8 +85,14 @@ def main():
     ap.add_argument("--no-rag", action="store_true", help="Force disable RAG (useful if RAG causes crashes)")
     ap.add_argument("--k", type=int, default=3, help="Top-k RAG chunks")
     ap.add_argument("--stop-after", action="store_true", help="Stop the model in Ollama after run")
+    ap.add_argument("--keep-alive", default=None,
+                    help="How long Ollama keeps the model loaded when idle (e.g. 5m, 1h, -1 = forever)")
     args = ap.parse_args()
 
+    manager = get_manager()
+    if args.keep_alive is not None:
+        manager.keep_alive = args.keep_alive
+
     print(f"Checking: {args.word}  | language: {args.lang}  | model: {args.model}  | RAG: {args.rag}")
     
     # Warn about known RAG issues on macOS with Python 3.13
@@ -174,13 +181,17 @@ def main():
             else:
                 print(f"  {i}. ❌ Does NOT contain «{final_word}»")
 
+        load = manager.load_time(args.model)
+        if load is not None:
+            print(f"\n⏱  Model load time: {load:.1f}s (kept loaded for {manager.keep_alive} when idle)")
+
     finally:
-        # optionally — free RAM after run
+        # optionally — free RAM after run (otherwise Ollama evicts after keep_alive)
         if args.stop_after:
             try:
-                subprocess.run(["ollama", "stop", args.model], check=False)
-            except Exception:
-                pass
+                manager.stop(args.model)
+            except Exception as e:
+                print(f"❌ Failed to stop model: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+# app/core/corpus.py
+# Compact, memory-mapped corpus store: each string column is one UTF-8 buffer plus
+# an int64 offsets array, so row i is buf[off[i]:off[i+1]] with no per-row Python objects
+# until it is actually read. Exact term lookup uses a sorted casefold key column
+# (binary search) instead of scanning the whole term column.
+#
+# Layout of a corpus directory:
+#   <col>.bin / <col>.off.npy  for col in term, text, key   (key = casefolded term, sorted)
+#   key.rows.npy               row id for each sorted key
+#   f.<name>.*                 optional structured fields (lang, pos, glosses, ipa, tr_uk, ...):
+#                              list fields are "\x1f"-joined string columns, string fields are
+#                              dictionary-encoded (f.<name>.codes.npy + vocabulary in meta.json)
+#   meta.json                  written last: a directory without it is an unfinished write
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, NamedTuple
+import json, os, shutil, tempfile, threading
+import numpy as np
+
+DEFAULT_PATH = Path("docs/corpus")
+LEGACY_PARQUET = Path("docs/entries.parquet")
+COLUMNS = ("term", "text")
+LIST_SEP = "\x1f"  # ASCII unit separator: never appears in dictionary text
+
+_build_lock = threading.Lock()  # one corpus migration at a time (GUI prewarm vs RAG worker, Streamlit sessions)
+
+
+class Hit(NamedTuple):
+    """One retrieval result."""
+    row: int
+    term: str
+    text: str
+    score: float
+
+
+def norm_term(s: str) -> str:
+    return s.strip().casefold()
+
+
+def gloss_of(text: str) -> str:
+    """Main gloss of an entries text blob ("EN: gloss | IPA: ... | ...")."""
+    return text.split(" | ", 1)[0].split(": ", 1)[-1]
+
+
+class _Column:
+    """Read-only view over an offset-indexed UTF-8 buffer."""
+
+    def __init__(self, base: Path):
+        self.off = np.load(base.with_name(base.name + ".off.npy"), mmap_mode="r")
+        size = int(self.off[-1])
+        # np.memmap can't map an empty file
+        self.buf = np.memmap(base.with_name(base.name + ".bin"), dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.off) - 1
+
+    def raw(self, i: int) -> bytes:
+        return self.buf[int(self.off[i]):int(self.off[i + 1])].tobytes()
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+
+def _write_column(base: Path, values: Iterable[str]) -> int:
+    offsets = [0]
+    with open(base.with_name(base.name + ".bin"), "wb") as f:
+        for v in values:
+            b = ("" if v is None else str(v)).encode("utf-8")
+            f.write(b)
+            offsets.append(offsets[-1] + len(b))
+    np.save(base.with_name(base.name + ".off.npy"), np.asarray(offsets, dtype=np.int64))
+    return len(offsets) - 1
+
+
+def _lower_bound(col: _Column, q: bytes) -> int:
+    lo, hi = 0, len(col)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if col.raw(mid) < q:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def write_key_index(base: Path, keys: list[str], rows: list[int] | None = None):
+    """Writes keys sorted (plus the row id of each key) for binary-search lookup."""
+    rows = list(range(len(keys))) if rows is None else rows
+    # UTF-8 byte order == code point order == Python str order, so bytes compare in lookup is consistent
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    _write_column(base, (keys[i] for i in order))
+    np.save(base.with_name(base.name + ".rows.npy"), np.asarray([rows[i] for i in order], dtype=np.int64))
+
+
+class KeyIndex:
+    """Sorted string keys -> row ids; exact and prefix lookup by binary search."""
+
+    def __init__(self, base: Path):
+        self.keys = _Column(base)
+        self.rows = np.load(base.with_name(base.name + ".rows.npy"), mmap_mode="r")
+
+    def find(self, key: str) -> list[int]:
+        q = key.encode("utf-8")
+        i = _lower_bound(self.keys, q)
+        out = []
+        while i < len(self.keys) and self.keys.raw(i) == q:
+            out.append(int(self.rows[i]))
+            i += 1
+        return sorted(out)
+
+    def prefix(self, key: str, limit: int = 50) -> list[int]:
+        q = key.encode("utf-8")
+        i = _lower_bound(self.keys, q)
+        out = []
+        while i < len(self.keys) and len(out) < limit and self.keys.raw(i).startswith(q):
+            out.append(int(self.rows[i]))
+            i += 1
+        return out
+
+
+def _as_list(v) -> list[str]:
+    if v is None or isinstance(v, str) or not hasattr(v, "__iter__"):
+        return [] if v is None or v == "" else [str(v)]
+    return [str(x) for x in v]
+
+
+def write_corpus(out_dir: Path, terms: list[str], texts: list[str],
+                 fields: dict[str, list] | None = None, list_fields: Iterable[str] = ()) -> Path:
+    """Writes term/text columns plus the sorted casefold key index into out_dir.
+
+    fields are extra per-row structured columns; names in list_fields hold lists of strings,
+    the rest are short strings (language code, part of speech) and get dictionary-encoded.
+    """
+    out_dir = Path(out_dir)
+    terms = ["" if t is None else str(t) for t in terms]
+    if len(terms) != len(texts):
+        raise ValueError(f"terms/texts length mismatch: {len(terms)} != {len(texts)}")
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    # readers never see a half-written corpus: build next to out_dir, then swap it in
+    tmp = Path(tempfile.mkdtemp(prefix=f"{out_dir.name}.tmp-", dir=out_dir.parent))
+    try:
+        _write_corpus_files(tmp, terms, texts, fields, list_fields)
+        _publish(tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return out_dir
+
+
+def _write_corpus_files(out_dir: Path, terms: list[str], texts: list[str],
+                        fields: dict[str, list] | None, list_fields: Iterable[str]):
+    _write_column(out_dir / "term", terms)
+    _write_column(out_dir / "text", texts)
+    write_key_index(out_dir / "key", [norm_term(t) for t in terms])
+
+    meta = {"lists": [], "dicts": {}}
+    list_fields = set(list_fields)
+    for name, values in (fields or {}).items():
+        if len(values) != len(terms):
+            raise ValueError(f"field {name!r} has {len(values)} rows, expected {len(terms)}")
+        if name in list_fields:
+            _write_column(out_dir / f"f.{name}", (LIST_SEP.join(_as_list(v)) for v in values))
+            meta["lists"].append(name)
+        else:
+            vocab: dict[str, int] = {}
+            codes = np.fromiter((vocab.setdefault("" if v is None else str(v), len(vocab)) for v in values),
+                                dtype=np.int64, count=len(values))
+            np.save(out_dir / f"f.{name}.codes.npy", codes.astype(np.uint16 if len(vocab) < 65536 else np.uint32))
+            meta["dicts"][name] = list(vocab)
+    (out_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False))
+
+
+def _publish(tmp: Path, out_dir: Path):
+    """Moves a finished corpus into place (os.replace can't overwrite a non-empty directory)."""
+    old = None
+    if out_dir.exists():
+        old = out_dir.with_name(f"{out_dir.name}.old-{os.getpid()}-{threading.get_ident()}")
+        os.replace(out_dir, old)
+    os.replace(tmp, out_dir)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+class Corpus:
+    """Memory-mapped corpus with zero-copy random access by row id."""
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        if not (path / "meta.json").exists():
+            raise FileNotFoundError(f"Missing or incomplete corpus in {path}")
+        self.path = path
+        self.terms = _Column(path / "term")
+        self.texts = _Column(path / "text")
+        self.keys = KeyIndex(path / "key")
+        meta = json.loads((path / "meta.json").read_text())
+        self._lists = {n: _Column(path / f"f.{n}") for n in meta["lists"]}
+        self._dicts = {n: (np.load(path / f"f.{n}.codes.npy", mmap_mode="r"), vocab)
+                       for n, vocab in meta["dicts"].items()}
+
+    @property
+    def fields(self) -> list[str]:
+        return [*self._dicts, *self._lists]
+
+    def field(self, i: int, name: str):
+        """Structured field of row i: list[str] for list fields, str for the others, None if absent."""
+        if name in self._lists:
+            raw = self._lists[name][i]
+            return raw.split(LIST_SEP) if raw else []
+        if name in self._dicts:
+            codes, vocab = self._dicts[name]
+            return vocab[int(codes[i])]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def term(self, i: int) -> str:
+        return self.terms[i]
+
+    def text(self, i: int) -> str:
+        return self.texts[i]
+
+    def hit(self, i: int, score: float) -> Hit:
+        return Hit(int(i), self.terms[i], self.texts[i], float(score))
+
+    def find_exact(self, query: str) -> list[int]:
+        """Row ids whose casefolded term equals the casefolded query, in corpus order."""
+        return self.keys.find(norm_term(query))
+
+    def find_prefix(self, prefix: str, limit: int = 50) -> list[int]:
+        """Row ids whose casefolded term starts with prefix, in term order."""
+        return self.keys.prefix(norm_term(prefix), limit)
+
+
+@lru_cache(maxsize=1)
+def load_corpus() -> Corpus:
+    """Process-wide corpus shared by retrieval and dictionary lookups."""
+    with _build_lock:
+        if not (DEFAULT_PATH / "meta.json").exists():
+            # one-time migration for indexes built before the compact corpus existed;
+            # a directory without meta.json is a crashed earlier attempt and gets replaced
+            if not LEGACY_PARQUET.exists():
+                raise FileNotFoundError(f"Missing {DEFAULT_PATH} (and {LEGACY_PARQUET})")
+            import pandas as pd
+            df = pd.read_parquet(LEGACY_PARQUET, columns=["term", "text"])
+            write_corpus(DEFAULT_PATH, df["term"].astype(str).tolist(), df["text"].astype(str).tolist())
+            del df
+        return Corpus(DEFAULT_PATH)
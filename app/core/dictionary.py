@@ -0,0 +1,73 @@
+# app/core/dictionary.py
+# Dictionary-first answers straight from the structured corpus fields (no LLM, no embedder):
+# translations (tr_<lc>), IPA, part of speech and glosses for an exact or normalised term.
+from __future__ import annotations
+from typing import NamedTuple
+
+from app.core.corpus import Corpus, load_corpus, norm_term
+from app.core.lexical import load_lexical
+
+
+class Sense(NamedTuple):
+    """One dictionary entry (row) for the looked-up term."""
+    term: str
+    pos: str
+    translations: list[str]
+    ipa: list[str]
+    glosses: list[str]
+    examples: list[str]
+
+
+def _senses(corpus: Corpus, rows: list[int], src: str, field: str) -> list[Sense]:
+    senses = []
+    for r in rows:
+        lang = corpus.field(r, "lang")
+        if lang is not None and lang != src:
+            continue
+        trs = corpus.field(r, field)
+        if trs:
+            senses.append(Sense(corpus.term(r), corpus.field(r, "pos") or "", trs,
+                                corpus.field(r, "ipa") or [], corpus.field(r, "glosses") or [],
+                                corpus.field(r, "examples") or []))
+    return senses
+
+
+def lookup_translation(term: str, from_lang: str = "en", to_lang: str = "uk") -> list[Sense] | None:
+    """Stored translations of term into to_lang, one Sense per matching entry.
+
+    Returns None when the corpus has no structured fields or no entry with translations,
+    so callers can fall back to the LLM.
+    """
+    try:
+        corpus = load_corpus()
+    except (OSError, ValueError, ImportError):
+        # no/unreadable corpus, or a legacy migration without pandas: the LLM still answers
+        return None
+    src, tgt = from_lang.strip().lower(), to_lang.strip().lower()
+    field = f"tr_{tgt}"
+    if field not in corpus.fields or not norm_term(term):
+        return None
+    senses = _senses(corpus, corpus.find_exact(term), src, field)
+    if not senses:
+        # "ran" -> "run", "Cats" -> "cat": inflected words often have their own form-of entry
+        # ("simple past of run") without translations, so also try the lemma
+        try:
+            lexical = load_lexical()
+        except (OSError, ValueError):
+            lexical = None
+        if lexical is not None:
+            senses = _senses(corpus, lexical.lemmas(term), src, field)
+    return senses or None
+
+
+def format_translation(term: str, from_lang: str, to_lang: str, senses: list[Sense]) -> str:
+    """Markdown answer built only from dictionary data."""
+    ipa = next((s.ipa[0] for s in senses if s.ipa), "")
+    head = f"**{senses[0].term}**" + (f" {ipa}" if ipa else "") + f" — {from_lang.upper()}→{to_lang.upper()}"
+    lines = [head, ""]
+    for s in senses:
+        pos = f"*{s.pos}*: " if s.pos else ""
+        lines.append(f"- {pos}{', '.join(s.translations)}")
+        if s.glosses:
+            lines.append(f"  - {s.glosses[0]}")
+    return "\n".join(lines)
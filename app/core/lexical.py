@@ -0,0 +1,193 @@
+# app/core/lexical.py
+# Lexical index used before dense search: inflected-form -> lemma map (from Wiktextract
+# "forms"), term prefix lookup, character-trigram fuzzy matching on terms, and BM25 over
+# term + gloss words. All postings are CSR arrays (memory-mapped .npy files).
+#
+# Layout of a lexical directory:
+#   form.*                    sorted inflected forms -> lemma row id  (KeyIndex)
+#   gram.* / gram.{ptr,rows}  trigram vocabulary + postings; gram.len.npy = #trigrams per term
+#   word.* / word.{ptr,rows,tf}  word vocabulary + postings; word.dl.npy = doc length
+from __future__ import annotations
+from array import array
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+import math, re
+import numpy as np
+
+from app.core.corpus import KeyIndex, _Column, _lower_bound, _write_column, norm_term, write_key_index
+
+DEFAULT_PATH = Path("docs/lexical")
+BM25_K1, BM25_B = 1.2, 0.75
+MAX_DF_FRAC = 0.1      # words in more than 10% of entries carry ~no signal; skipped at query time
+FUZZY_MIN_SIM = 0.5    # Dice similarity below this is noise
+FORM_SCORE = 0.95      # inflected form of a known lemma: almost as good as an exact term match
+LEXICAL_CONFIDENT = 0.7  # best lexical score at/above which rag skips the embedder (form/prefix/fuzzy only)
+# A bag-of-words gloss match ranks candidates but is not evidence that the query *is* that term,
+# so BM25 alone stays below LEXICAL_CONFIDENT and paraphrase queries still reach dense search.
+BM25_MAX = 0.6
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def words(s: str) -> list[str]:
+    return _WORD_RE.findall(s.casefold())
+
+
+def trigrams(term: str) -> list[str]:
+    t = f"#{norm_term(term)}#"
+    return [t[i:i + 3] for i in range(len(t) - 2)] or [t]
+
+
+# ---------------- build ----------------
+def _write_postings(base: Path, docs: Iterable[list[str]], with_tf: bool) -> np.ndarray:
+    """Writes vocabulary column + CSR postings; returns per-doc token counts."""
+    vocab: dict[str, int] = {}
+    tok_ids, rows, tfs, lens = array("I"), array("I"), array("H"), array("I")
+    for r, toks in enumerate(docs):
+        lens.append(len(toks))
+        for t, c in Counter(toks).items():
+            tok_ids.append(vocab.setdefault(t, len(vocab)))
+            rows.append(r)
+            tfs.append(min(c, 65535))
+    keys = sorted(vocab)
+    remap = np.empty(len(vocab), dtype=np.int64)
+    remap[[vocab[k] for k in keys]] = np.arange(len(keys))
+    tid = remap[np.frombuffer(tok_ids, dtype=np.uint32)] if tok_ids else np.zeros(0, np.int64)
+    order = np.argsort(tid, kind="stable")  # stable: rows stay ascending within a token
+    ptr = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tid, minlength=len(keys)), out=ptr[1:])
+    _write_column(base, keys)
+    np.save(base.with_name(base.name + ".ptr.npy"), ptr)
+    np.save(base.with_name(base.name + ".rows.npy"), np.frombuffer(rows, dtype=np.uint32)[order] if rows else np.zeros(0, np.uint32))
+    if with_tf:
+        np.save(base.with_name(base.name + ".tf.npy"), np.frombuffer(tfs, dtype=np.uint16)[order] if tfs else np.zeros(0, np.uint16))
+    return np.frombuffer(lens, dtype=np.uint32) if lens else np.zeros(0, np.uint32)
+
+
+def build_lexical(out_dir: Path, terms: list[str], glosses: list[str],
+                  forms: list[list[str]] | None = None) -> Path:
+    """Builds the lexical index for rows aligned with the corpus (same row ids)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # inflected form -> lemma row (forms equal to the term itself are already exact matches)
+    fkeys, frows = [], []
+    for r, fs in enumerate(forms or []):
+        own = norm_term(terms[r])
+        for f in set(norm_term(x) for x in fs or [] if x):
+            if f and f != own:
+                fkeys.append(f)
+                frows.append(r)
+    write_key_index(out_dir / "form", fkeys, frows)
+
+    glen = _write_postings(out_dir / "gram", (trigrams(t) for t in terms), with_tf=False)
+    np.save(out_dir / "gram.len.npy", glen.astype(np.uint16))
+    dl = _write_postings(out_dir / "word", (words(f"{t} {g}") for t, g in zip(terms, glosses)), with_tf=True)
+    np.save(out_dir / "word.dl.npy", dl)
+    return out_dir
+
+
+# ---------------- query ----------------
+class _Postings:
+    def __init__(self, base: Path, with_tf: bool):
+        self.vocab = _Column(base)
+        self.ptr = np.load(base.with_name(base.name + ".ptr.npy"), mmap_mode="r")
+        self.rows = np.load(base.with_name(base.name + ".rows.npy"), mmap_mode="r")
+        self.tf = np.load(base.with_name(base.name + ".tf.npy"), mmap_mode="r") if with_tf else None
+
+    def span(self, token: str) -> tuple[int, int] | None:
+        q = token.encode("utf-8")
+        i = _lower_bound(self.vocab, q)
+        if i < len(self.vocab) and self.vocab.raw(i) == q:
+            return int(self.ptr[i]), int(self.ptr[i + 1])
+        return None
+
+
+class LexicalIndex:
+    """Form / prefix / fuzzy / BM25 lookups; every score is in [0, 1]."""
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        if not (path / "word.ptr.npy").exists():
+            raise FileNotFoundError(f"Missing lexical index in {path}")
+        self.forms = KeyIndex(path / "form")
+        self.grams = _Postings(path / "gram", with_tf=False)
+        self.gram_len = np.load(path / "gram.len.npy", mmap_mode="r")
+        self.words = _Postings(path / "word", with_tf=True)
+        self.doc_len = np.load(path / "word.dl.npy", mmap_mode="r")
+        self.n_docs = len(self.doc_len)
+        self.avg_dl = float(self.doc_len.mean()) if self.n_docs else 1.0
+
+    def lemmas(self, query: str) -> list[int]:
+        """Rows of lemmas that list query among their inflected forms."""
+        return self.forms.find(norm_term(query))
+
+    def fuzzy(self, query: str, n: int = 20) -> dict[int, float]:
+        """Trigram Dice similarity between query and terms (typos, near spellings)."""
+        qg = set(trigrams(query))
+        spans = [s for s in (self.grams.span(g) for g in qg) if s]
+        if not spans:
+            return {}
+        cand = np.concatenate([self.grams.rows[a:b] for a, b in spans])
+        ids, cnt = np.unique(cand, return_counts=True)
+        sim = 2.0 * cnt / (len(qg) + self.gram_len[ids])
+        top = np.argsort(-sim)[:n]
+        return {int(ids[i]): float(sim[i]) for i in top if sim[i] >= FUZZY_MIN_SIM}
+
+    def bm25(self, query: str, n: int = 20) -> dict[int, float]:
+        """BM25 over term + gloss words, normalised so that every query word found once
+        in an average-length entry scores 1.0."""
+        rows, scores, best = [], [], 0.0
+        for w in set(words(query)):
+            s = self.words.span(w)
+            if not s:
+                continue
+            a, b = s
+            df = b - a
+            if df > MAX_DF_FRAC * self.n_docs and self.n_docs > 100:
+                continue
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            r = np.asarray(self.words.rows[a:b], dtype=np.int64)
+            tf = np.asarray(self.words.tf[a:b], dtype=np.float32)
+            dl = self.doc_len[r].astype(np.float32)
+            rows.append(r)
+            scores.append(idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / self.avg_dl)))
+            best += idf
+        if not rows:
+            return {}
+        ids, inv = np.unique(np.concatenate(rows), return_inverse=True)
+        tot = np.bincount(inv, weights=np.concatenate(scores))
+        top = np.argsort(-tot)[:n]
+        return {int(ids[i]): min(1.0, float(tot[i] / best)) for i in top}
+
+    def search(self, query: str, corpus=None, n: int = 20) -> dict[int, float]:
+        """Fused lexical score per row: the best of form, prefix, fuzzy and BM25 evidence."""
+        q = norm_term(query)
+        out: dict[int, float] = {}
+
+        def put(row: int, score: float):
+            if score > out.get(row, 0.0):
+                out[row] = score
+
+        for r in self.lemmas(q):
+            put(r, FORM_SCORE)
+        if corpus is not None and len(q) >= 3:
+            for r in corpus.find_prefix(q, limit=n):
+                # "serend" -> "serendipity": the more of the term the prefix covers, the better
+                put(r, 0.5 + 0.4 * len(q) / max(len(norm_term(corpus.term(r))), 1))
+        for r, s in self.fuzzy(q, n).items():
+            put(r, s)
+        for r, s in self.bm25(q, n).items():
+            put(r, BM25_MAX * s)
+        return dict(sorted(out.items(), key=lambda kv: -kv[1])[:n])
+
+
+@lru_cache(maxsize=1)
+def load_lexical() -> LexicalIndex | None:
+    """Process-wide lexical index; None for indexes built before it existed."""
+    try:
+        return LexicalIndex(DEFAULT_PATH)
+    except FileNotFoundError:
+        return None
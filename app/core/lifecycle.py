@@ -0,0 +1,87 @@
+# app/core/lifecycle.py
+# Model residency: prewarm the LLM (and the RAG embedder) before the first request,
+# keep models loaded for a keep_alive window, and evict them through the Ollama API.
+# Idle eviction itself is done by Ollama: every request carries the pool's keep_alive,
+# so a model is unloaded once it has been idle for that long.
+from __future__ import annotations
+
+import threading, time
+from functools import lru_cache
+from typing import Callable
+
+from app.core.llm_pool import LLMPool, get_pool
+
+
+class ModelManager:
+    """Prewarms / evicts models and remembers how long loads took."""
+
+    def __init__(self, pool: LLMPool | None = None):
+        self.pool = pool or get_pool()
+        self._lock = threading.Lock()
+        self._warming: set[str] = set()
+        self.embedder_load_time: float | None = None
+
+    @property
+    def keep_alive(self):
+        return self.pool.keep_alive
+
+    @keep_alive.setter
+    def keep_alive(self, value):
+        self.pool.keep_alive = value
+
+    def load_time(self, model: str) -> float | None:
+        return self.pool.load_time(model)
+
+    def _warm_embedder(self) -> float:
+        if self.embedder_load_time is not None:
+            return 0.0
+        t0 = time.perf_counter()
+        from app.core.rag import _load_corpus, _load_index, _load_embedder  # heavy, import lazily
+        _load_corpus(); _load_index()
+        _load_embedder().encode(["warmup"], normalize_embeddings=True)
+        self.embedder_load_time = time.perf_counter() - t0
+        return self.embedder_load_time
+
+    def prewarm(self, model: str, rag: bool = False,
+                on_done: Callable[[str], None] | None = None) -> threading.Thread | None:
+        """Loads model (and the embedder if rag) in a background thread.
+
+        on_done receives a one-line status message (load times or the error).
+        Returns None if the same model is already being warmed.
+        """
+        with self._lock:
+            if model in self._warming:
+                return None
+            self._warming.add(model)
+
+        def run():
+            msgs = []
+            try:
+                t0 = time.perf_counter()
+                self.pool.warm(model)
+                msgs.append(f"model {model} ready in {time.perf_counter() - t0:.1f}s")
+            except Exception as e:
+                msgs.append(f"model {model} prewarm failed: {e}")
+            if rag:
+                try:
+                    secs = self._warm_embedder()
+                    msgs.append(f"embedder ready in {secs:.1f}s" if secs else "embedder ready")
+                except Exception as e:
+                    msgs.append(f"embedder prewarm failed: {e}")
+            with self._lock:
+                self._warming.discard(model)
+            if on_done:
+                on_done("; ".join(msgs))
+
+        th = threading.Thread(target=run, daemon=True)
+        th.start()
+        return th
+
+    def stop(self, model: str):
+        """Evicts model now (replaces shelling out to `ollama stop`)."""
+        self.pool.unload(model)
+
+
+@lru_cache(maxsize=1)
+def get_manager() -> ModelManager:
+    return ModelManager()
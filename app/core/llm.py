@@ -1,5 +1,7 @@
 # app/core/llm.py
-import ollama
+from app.core.dictionary import Sense, format_translation, lookup_translation
+from app.core.llm_pool import get_pool
+from app.core.prompts import NUANCE_PROMPT
 
 DEFAULT_OPTIONS = {"num_ctx": 256, "num_predict": 120, "temperature": 0.2}
 
@@ -12,29 +14,39 @@ def call_llm(prompt: str,
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
     opts = {**DEFAULT_OPTIONS, **(options or {})}
-    resp = ollama.chat(model=model, messages=messages, options=opts)
-    return resp["message"]["content"]
+    return get_pool().chat(model, messages, opts)
 
 
-def translate_word(word: str, from_lang: str = "EN", to_lang: str = "UK"):
+def translate_word(word: str, from_lang: str = "EN", to_lang: str = "UK", use_dictionary: bool = True):
     """
-    Translate a word using Ollama with specific translation prompt.
+    Translate a word: dictionary translations first, Ollama only if the dictionary has none.
     
     Args:
         word: The word to translate
         from_lang: Source language (default: "EN")
         to_lang: Target language (default: "UK")
+        use_dictionary: Answer from stored Wiktextract translations when available (default: True)
     
     Returns:
         The translated word/content
     """
+    if use_dictionary:
+        senses = lookup_translation(word, from_lang, to_lang)
+        if senses:
+            return format_translation(word, from_lang, to_lang, senses)
     prompt = f"Word: {word}. {from_lang}->{to_lang}"
-    resp = ollama.chat(
-        model="qwen2.5:3b-instruct",
-        messages=[{"role": "user", "content": prompt}],
-        options={"num_ctx": 256, "num_predict": 120, "temperature": 0.2}
+    return get_pool().chat(
+        "qwen2.5:3b-instruct",
+        [{"role": "user", "content": prompt}],
+        {"num_ctx": 256, "num_predict": 120, "temperature": 0.2},
     )
-    return resp["message"]["content"]
+
+def translation_nuance(word: str, senses: list[Sense], from_lang: str = "EN", to_lang: str = "UK",
+                       model: str = "qwen2.5:3b-instruct") -> str:
+    """Examples and usage notes for a dictionary translation (the slow, optional part)."""
+    translations = "; ".join(", ".join(s.translations) for s in senses)
+    prompt = NUANCE_PROMPT.format(text=word, source=from_lang, target=to_lang, translations=translations)
+    return call_llm(prompt, model=model, options={"num_ctx": 512, "num_predict": 300})
 
 # Example usage (uncomment to test):
 # if __name__ == "__main__":
@@ -0,0 +1,290 @@
+# app/core/llm_pool.py
+# Pool of LLM backends (Ollama hosts and OpenAI-compatible local servers).
+# Each backend keeps one persistent HTTP client, a concurrency limit and a simple
+# health state; requests go to the least-loaded healthy backend and fail over.
+#
+# Configure with LLM_BACKENDS, comma-separated "kind=url[#max_concurrency]", e.g.
+#   LLM_BACKENDS="ollama=http://localhost:11434#2,ollama=http://gpu-box:11434#4,openai=http://llm-box:8000/v1"
+from __future__ import annotations
+
+import os, threading, time
+from functools import lru_cache
+
+import backoff
+
+DEFAULT_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+# How long Ollama keeps a model resident after its last request (idle eviction), e.g. "15m", "1h", -1 = forever
+DEFAULT_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "15m")
+DEFAULT_CONCURRENCY = 2
+FAIL_COOLDOWN = 30.0  # seconds a failed backend is skipped before being retried
+MAX_TRIES = 3         # attempts per backend (with exponential backoff) before failing over
+
+
+class BackendUnavailable(RuntimeError):
+    """Raised when no backend in the pool could serve a request."""
+
+
+class Backend:
+    """One inference server with a persistent client, a concurrency limit and health state."""
+
+    def __init__(self, kind: str, host: str | None = None,
+                 max_concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT, api_key: str | None = None):
+        if kind not in ("ollama", "openai"):
+            raise ValueError(f"Unknown backend kind: {kind!r} (expected 'ollama' or 'openai')")
+        self.kind = kind
+        self.host = host
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY") or "not-needed"
+        self._lock = threading.Lock()
+        self._client = None
+        self.in_flight = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.load_times: dict[str, float] = {}  # model -> seconds of the last cold load seen
+
+    def __repr__(self) -> str:
+        return f"Backend({self.kind}, {self.host or 'default'}, in_flight={self.in_flight}/{self.max_concurrency})"
+
+    # --- persistent client (created lazily, reused for every request) ---
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if self.kind == "ollama":
+                        import ollama
+                        self._client = ollama.Client(host=self.host, timeout=self.timeout)
+                    else:
+                        import openai
+                        # retries are handled by the pool, not by the SDK
+                        self._client = openai.OpenAI(base_url=self.host, api_key=self.api_key,
+                                                     timeout=self.timeout, max_retries=0)
+        return self._client
+
+    # --- load / health ---
+    @property
+    def load(self) -> float:
+        return self.in_flight / self.max_concurrency
+
+    def try_acquire(self) -> bool:
+        """Reserves a request slot without blocking; in_flight counts it from this moment."""
+        with self._lock:
+            if self.in_flight >= self.max_concurrency:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def healthy(self, now: float | None = None) -> bool:
+        return (now or time.monotonic()) >= self.down_until
+
+    def _mark_ok(self):
+        with self._lock:
+            self.failures = 0
+            self.down_until = 0.0
+
+    def _mark_failed(self):
+        with self._lock:
+            self.failures += 1
+            self.down_until = time.monotonic() + FAIL_COOLDOWN * min(self.failures, 4)
+
+    # --- request ---
+    def _record_load(self, model: str, resp) -> float:
+        # Ollama reports load_duration in ns; a few ms means the model was already resident
+        secs = (resp.get("load_duration") or 0) / 1e9
+        if secs > 0.05:
+            self.load_times[model] = secs
+        return secs
+
+    def _chat_once(self, model: str, messages: list[dict], options: dict, keep_alive=None) -> str:
+        if self.kind == "ollama":
+            kw = _keep_alive_kw(keep_alive)
+            resp = self.client.chat(model=model, messages=messages, options=options, **kw)
+            self._record_load(model, resp)
+            return resp["message"]["content"]
+        kw = {}
+        if "temperature" in options:
+            kw["temperature"] = options["temperature"]
+        if "num_predict" in options:
+            kw["max_tokens"] = options["num_predict"]
+        resp = self.client.chat.completions.create(model=model, messages=messages, **kw)
+        return resp.choices[0].message.content or ""
+
+    def warm(self, model: str, keep_alive=None) -> float:
+        """Loads model into memory without generating; returns load time in seconds."""
+        if self.kind != "ollama":
+            return 0.0  # OpenAI-compatible servers manage residency themselves
+        kw = _keep_alive_kw(keep_alive)
+        return self._record_load(model, self.client.generate(model=model, prompt="", **kw))
+
+    def unload(self, model: str):
+        if self.kind == "ollama":
+            self.client.generate(model=model, prompt="", keep_alive=0)
+
+    def chat(self, model: str, messages: list[dict], options: dict, keep_alive=None) -> str:
+        """Runs one request with backoff; the caller must hold a slot (see try_acquire)."""
+        call = backoff.on_exception(backoff.expo, Exception, max_tries=MAX_TRIES,
+                                    max_time=self.timeout, giveup=_is_client_error)(self._chat_once)
+        try:
+            out = call(model, messages, options, keep_alive)
+        except Exception as e:
+            # a 4xx (e.g. model not pulled on this host) says nothing about the host's health
+            if not _is_client_error(e):
+                self._mark_failed()
+            raise
+        self._mark_ok()
+        return out
+
+
+def normalize_keep_alive(value):
+    """Ollama parses string keep_alive as a Go duration ("15m"), so unit-less numbers must be sent
+    as numbers (seconds; -1 = forever, 0 = unload now)."""
+    if isinstance(value, str):
+        v = value.strip()
+        try:
+            return int(v)
+        except ValueError:
+            try:
+                return float(v)
+            except ValueError:
+                return v
+    return value
+
+
+def _keep_alive_kw(keep_alive) -> dict:
+    return {} if keep_alive is None else {"keep_alive": normalize_keep_alive(keep_alive)}
+
+
+def _is_client_error(e: Exception) -> bool:
+    """4xx responses (e.g. unknown model) won't get better by retrying on the same backend."""
+    code = getattr(e, "status_code", None)
+    return isinstance(code, int) and 400 <= code < 500 and code != 429
+
+
+class LLMPool:
+    """Routes chat requests to the least-loaded healthy backend, failing over on errors."""
+
+    def __init__(self, backends: list[Backend], keep_alive=DEFAULT_KEEP_ALIVE):
+        if not backends:
+            raise ValueError("LLMPool needs at least one backend")
+        self.backends = list(backends)
+        self.keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)  # notified whenever a slot is released
+
+    def _candidates(self, exclude: set[int] = frozenset()) -> list[Backend]:
+        """Healthy backends by load; cooled-down ones (soonest to recover first) only if none are healthy."""
+        now = time.monotonic()
+        left = [b for b in self.backends if id(b) not in exclude]
+        healthy = sorted((b for b in left if b.healthy(now)), key=lambda b: b.load)
+        return healthy or sorted(left, key=lambda b: b.down_until)
+
+    def _reserve(self, exclude: set[int]) -> Backend | None:
+        """Picks the least-loaded backend not in exclude and takes a slot on it.
+
+        Choosing and reserving happen under the pool lock, so simultaneous requests see each
+        other's load. Blocks only while every remaining backend is full; None if none remain.
+        """
+        with self._freed:
+            while True:
+                cands = self._candidates(exclude)
+                if not cands:
+                    return None
+                for b in cands:
+                    if b.try_acquire():
+                        return b
+                self._freed.wait(timeout=1.0)
+
+    def _release(self, b: Backend):
+        b.release()
+        with self._freed:
+            self._freed.notify()
+
+    def chat(self, model: str, messages: list[dict], options: dict | None = None, keep_alive=None) -> str:
+        keep_alive = self.keep_alive if keep_alive is None else keep_alive
+        errors, tried = [], set()
+        while (b := self._reserve(tried)) is not None:
+            tried.add(id(b))
+            try:
+                return b.chat(model, messages, options or {}, keep_alive)
+            except Exception as e:
+                errors.append(f"{b.kind}@{b.host or 'default'}: {e}")
+            finally:
+                self._release(b)
+        raise BackendUnavailable("All LLM backends failed:\n" + "\n".join(errors))
+
+    def warm(self, model: str, keep_alive=None) -> float:
+        """Loads model on the backend most likely to serve the next request."""
+        keep_alive = self.keep_alive if keep_alive is None else keep_alive
+        errors, tried = [], set()
+        while cands := self._candidates(tried):
+            b = cands[0]
+            tried.add(id(b))
+            try:
+                return b.warm(model, keep_alive)
+            except Exception as e:
+                if not _is_client_error(e):
+                    b._mark_failed()
+                errors.append(f"{b.kind}@{b.host or 'default'}: {e}")
+        raise BackendUnavailable("Could not load model on any backend:\n" + "\n".join(errors))
+
+    def unload(self, model: str):
+        """Evicts model from every Ollama backend; raises BackendUnavailable listing the hosts that failed."""
+        errors = []
+        for b in self.backends:
+            try:
+                b.unload(model)
+            except Exception as e:
+                # 404: the model isn't on that host, so there is nothing to unload
+                if not _is_client_error(e):
+                    errors.append(f"{b.kind}@{b.host or 'default'}: {e}")
+        if errors:
+            raise BackendUnavailable(f"Could not unload {model} on:\n" + "\n".join(errors))
+
+    def load_time(self, model: str) -> float | None:
+        times = [b.load_times[model] for b in self.backends if model in b.load_times]
+        return max(times) if times else None
+
+    @property
+    def capacity(self) -> int:
+        return sum(b.max_concurrency for b in self.backends)
+
+    def chat_many(self, model: str, batch: list[list[dict]], options: dict | None = None) -> list[str]:
+        """Runs a batch of conversations with enough workers to keep every backend busy."""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.capacity) as ex:
+            return list(ex.map(lambda msgs: self.chat(model, msgs, options), batch))
+
+    def status(self) -> list[dict]:
+        now = time.monotonic()
+        return [{"kind": b.kind, "host": b.host, "in_flight": b.in_flight,
+                 "max_concurrency": b.max_concurrency, "healthy": b.healthy(now),
+                 "failures": b.failures, "load_times": dict(b.load_times)} for b in self.backends]
+
+
+def parse_backends(spec: str, timeout: float = DEFAULT_TIMEOUT) -> list[Backend]:
+    """Parses "kind=url[#n],kind=url[#n]" into backends; a bare URL means Ollama."""
+    out = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kind, _, rest = item.partition("=") if "=" in item.split("://", 1)[0] else ("ollama", "", item)
+        host, _, conc = rest.partition("#")
+        out.append(Backend(kind.strip().lower(), host.strip() or None,
+                           max_concurrency=int(conc) if conc else DEFAULT_CONCURRENCY,
+                           timeout=timeout))
+    return out
+
+
+@lru_cache(maxsize=1)
+def get_pool() -> LLMPool:
+    """Process-wide pool; defaults to the local Ollama host (honours OLLAMA_HOST)."""
+    spec = os.getenv("LLM_BACKENDS", "").strip()
+    backends = parse_backends(spec) if spec else [Backend("ollama", os.getenv("OLLAMA_HOST"))]
+    return LLMPool(backends)
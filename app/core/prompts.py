@@ -11,3 +11,12 @@ Example:
 
 
 """
+
+# Used after a dictionary hit: translations are already known, the LLM only adds what the dictionary lacks
+NUANCE_PROMPT = """
+You are an experienced linguist. The dictionary translates «{text}» ({source}->{target}) as: {translations}.
+Do NOT repeat or change the translations. Provide only:
+1) 3 example sentences in {source} with their translation to {target}
+2) Short notes on nuance / usage differences between the translations
+Answer in Ukrainian in markdown.
+"""
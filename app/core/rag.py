@@ -2,9 +2,11 @@
 from __future__ import annotations
 from pathlib import Path
 from functools import lru_cache
-import os, numpy as np, pandas as pd, faiss
+import os, numpy as np, faiss
 import multiprocessing as mp
 from sentence_transformers import SentenceTransformer
+from app.core.corpus import Hit, load_corpus as _load_corpus
+from app.core.lexical import LEXICAL_CONFIDENT, load_lexical as _load_lexical
 from app.core.llm import call_llm
 
 # Configure multiprocessing to avoid issues
@@ -17,14 +19,9 @@ try:
 except RuntimeError:
     pass  # Already set
 
-PATH_PAR = Path("docs/entries.parquet")
 PATH_IDX = Path("docs/index.faiss")
 
-@lru_cache(maxsize=1)
-def _load_df() -> pd.DataFrame:
-    if not PATH_PAR.exists():
-        raise FileNotFoundError(f"Missing {PATH_PAR}")
-    return pd.read_parquet(PATH_PAR)
+HYBRID_ALPHA = 0.5  # weight of the lexical score when fusing with the dense (cosine) score
 
 @lru_cache(maxsize=1)
 def _load_index() -> faiss.Index:
@@ -42,27 +39,46 @@ def _load_embedder() -> SentenceTransformer:
         cache_folder=None  # Disable caching to avoid multiprocessing issues
     )
 
-def retrieve(query: str, k: int = 4):
-    """Top-k: first exact match (term==query), then FAISS."""
-    df = _load_df()
-    index = _load_index()
-    emb = _load_embedder()
+RETRIEVAL_MODES = ("hybrid", "lexical", "dense")
+
+def retrieve(query: str, k: int = 4, mode: str = "hybrid") -> tuple[list[Hit], list[float]]:
+    """Top-k: exact term matches first, then lexical (forms/prefix/fuzzy/BM25) fused with FAISS.
+
+    The embedder only runs when the lexical index isn't confident about the query.
+    mode="lexical" never runs the embedder; mode="dense" skips the lexical index (exact + FAISS).
+    """
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {mode!r} (expected one of {RETRIEVAL_MODES})")
+    corpus = _load_corpus()
+
+    # 1) exact match ("high" score)
+    exact = corpus.find_exact(query)[:k]
+    hits = [corpus.hit(i, 1.0) for i in exact]
+    if len(hits) >= k:
+        return hits, [h.score for h in hits]
+    seen = set(exact)
 
-    # 1) exact match
-    exact_idx = df.index[df["term"].str.casefold() == query.strip().casefold()].tolist()
+    # 2) lexical candidates
+    lexical = _load_lexical() if mode != "dense" else None
+    lex = {}
+    if lexical is not None:
+        lex = {r: s for r, s in lexical.search(query, corpus, n=max(4 * k, 20)).items() if r not in seen}
 
-    # 2) semantic search
-    qv = emb.encode([query], normalize_embeddings=True).astype("float32")
-    D, I = index.search(qv, max(k, 4))
-    faiss_idx = [i for i in I[0].tolist() if i not in exact_idx]
+    # 3) dense search only when lexical evidence is weak, then fuse
+    if mode == "lexical" or (lex and max(lex.values()) >= LEXICAL_CONFIDENT):
+        fused = lex
+    else:
+        index = _load_index()
+        emb = _load_embedder()
+        qv = emb.encode([query], normalize_embeddings=True).astype("float32")
+        D, I = index.search(qv, max(2 * k, 4))
+        dense = {i: d for i, d in zip(I[0].tolist(), D[0].tolist()) if i >= 0 and i not in seen}
+        fused = {r: HYBRID_ALPHA * lex.get(r, 0.0) + (1 - HYBRID_ALPHA) * dense.get(r, 0.0)
+                 for r in lex.keys() | dense.keys()} if lex else dense
 
-    # 3) mix: exact first
-    idxs = (exact_idx + faiss_idx)[:k]
-    hits = df.iloc[idxs].copy()
-    # "high" scores for exact
-    scores = [1.0]*len(exact_idx) + D[0].tolist()
-    hits["__score"] = scores[:len(hits)]
-    return hits, hits["__score"].tolist()
+    for r, sc in sorted(fused.items(), key=lambda kv: -kv[1])[:k - len(hits)]:
+        hits.append(corpus.hit(r, sc))
+    return hits, [h.score for h in hits]
 
 def _clip(text: str, n: int) -> str:
     return text if len(text) <= n else text[:n].rsplit("\n",1)[0] + "…"
@@ -87,7 +103,7 @@ def ask_with_rag_def(term: str, k: int = 4, model: str = "qwen2.5:3b-instruct",
                      max_context_chars: int = 1200, llm_options: dict | None = None):
     try:
         hits, _ = retrieve(term, k=k)
-        parts = [f"TERM: {row['term']}\nTEXT:\n{row['text']}" for _, row in hits.iterrows()]
+        parts = [f"TERM: {h.term}\nTEXT:\n{h.text}" for h in hits]
         ctx = _clip("\n\n---\n\n".join(parts), max_context_chars)
         prompt = build_prompt_def(term, ctx)
         return call_llm(prompt, model=model, options=llm_options)
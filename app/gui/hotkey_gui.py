@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os, re, json, subprocess, threading
+import os, re, json, threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 
@@ -14,6 +14,7 @@ os.environ["NUMEXPR_NUM_THREADS"] = "4"
 
 from pynput import keyboard  # глобальна гаряча клавіша
 from app.core.llm import call_llm
+from app.core.lifecycle import get_manager
 
 # Import with fallback for RAG
 try:
@@ -97,6 +98,7 @@ class App(tk.Tk):
         super().__init__()
         self.title("Language Helper — mini GUI")
         self.geometry("640x520")
+        self.manager = get_manager()
         self._build_ui()
         self.withdraw()  # стартуємо захованим
 
@@ -122,7 +124,9 @@ class App(tk.Tk):
 
         self.model = tk.StringVar(value=DEFAULT_MODEL)
         ttk.Label(frm, text="Model:").grid(row=2, column=2, sticky="e")
-        ttk.Combobox(frm, textvariable=self.model, values=["qwen2.5:3b-instruct","qwen2.5:7b-instruct"], width=22, state="readonly").grid(row=2, column=3, sticky="ew", **pad)
+        cb_model = ttk.Combobox(frm, textvariable=self.model, values=["qwen2.5:3b-instruct","qwen2.5:7b-instruct"], width=22, state="readonly")
+        cb_model.grid(row=2, column=3, sticky="ew", **pad)
+        cb_model.bind("<<ComboboxSelected>>", lambda e: self.prewarm())
 
         self.use_rag = tk.BooleanVar(value=False)  # Disable RAG by default to prevent crashes
         ttk.Checkbutton(frm, text="Use RAG", variable=self.use_rag).grid(row=3, column=0, sticky="w", **pad)
@@ -151,6 +155,15 @@ class App(tk.Tk):
         self.lift()
         self.focus_force()
         self.ent_word.focus_set()
+        self.prewarm()
+
+    def prewarm(self):
+        # load the model (and embedder if RAG is on) while the user is still typing
+        model = self.model.get()
+        th = self.manager.prewarm(model, rag=self.use_rag.get() and RAG_AVAILABLE,
+                                  on_done=lambda msg: self._ui(lambda: self.log(f"🔥 {msg}")))
+        if th:
+            self.log(f"🔥 Warming up {model}...")
 
     def hide(self):
         self.withdraw()
@@ -164,7 +177,7 @@ class App(tk.Tk):
 
     def stop_model(self):
         try:
-            subprocess.run(["ollama", "stop", self.model.get()], check=False)
+            self.manager.stop(self.model.get())
             self.log("🧹 Model stopped (ollama).")
         except Exception as e:
             messagebox.showerror("Error", f"ollama stop failed: {e}")
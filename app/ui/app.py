@@ -1,6 +1,7 @@
 import streamlit as st
 from app.core.prompts import WORD_PROMPT
-from app.core.llm import call_llm
+from app.core.llm import call_llm, translation_nuance
+from app.core.dictionary import format_translation, lookup_translation
 
 st.set_page_config(page_title="Language Helper (local)", page_icon="🗣️")
 st.title("🗣️ Language Helper — locally, no keys required")
@@ -10,9 +11,20 @@ col1, col2, col3 = st.columns(3)
 src = col1.selectbox("Source language", ["en", "pl", "uk"])
 tgt = col2.selectbox("Target language", ["uk", "pl", "en"])
 model = col3.selectbox("Model (local)", ["qwen2.5:7b-instruct", "mistral", "llama3.1:8b-instruct"])
+use_dict = st.checkbox("Dictionary first (instant)", value=True)
+add_nuance = st.checkbox("Add examples & nuance from the LLM", value=True)
 
 if st.button("Translate") and text:
-    with st.spinner("Generating response locally..."):
-        prompt = WORD_PROMPT.format(text=text, source=src, target=tgt)
-        answer_md = call_llm(prompt, model=model)
-    st.markdown(answer_md)
+    senses = lookup_translation(text, src, tgt) if use_dict else None
+    if senses:
+        # dictionary answer is shown right away; the LLM part is appended when it is ready
+        st.markdown(format_translation(text, src, tgt, senses))
+        st.caption("⚡ From the dictionary (Wiktextract)")
+        if add_nuance:
+            with st.spinner("Adding examples and nuance locally..."):
+                st.markdown(translation_nuance(text, senses, from_lang=src, to_lang=tgt, model=model))
+    else:
+        with st.spinner("Generating response locally..."):
+            prompt = WORD_PROMPT.format(text=text, source=src, target=tgt)
+            answer_md = call_llm(prompt, model=model)
+        st.markdown(answer_md)
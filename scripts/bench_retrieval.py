@@ -0,0 +1,160 @@
+# scripts/bench_retrieval.py
+# Retrieval quality + latency benchmark over docs/corpus.
+# Labelled queries are derived from the corpus itself:
+#   term      the entry's term as is
+#   casefold  UPPER / Title variant of the term
+#   typo      one synthetic edit (deletion, transposition or substitution), terms of 5+ chars
+#   gloss     the entry's gloss as a paraphrase query
+# A query counts as found when any row with the same (casefolded) term — or, for gloss
+# queries, the source row — is in the top-k.
+#
+# Usage:
+#   python scripts/bench_retrieval.py --n 300 --modes hybrid,lexical,dense --save-baseline docs/bench_baseline.json
+#   python scripts/bench_retrieval.py --baseline docs/bench_baseline.json   # exit 1 on regression
+
+import os
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+import argparse, json, random, sys, time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # allow `python scripts/bench_retrieval.py`
+from app.core.corpus import gloss_of, norm_term
+from app.core.rag import RETRIEVAL_MODES, _load_corpus, retrieve
+
+KINDS = ("term", "casefold", "typo", "gloss")
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_typo(w: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(w) - 1)  # keep the first letter, like most real typos
+    op = rng.choice(("del", "swap", "sub"))
+    if op == "del":
+        return w[:i] + w[i + 1:]
+    if op == "swap":
+        return w[:i] + w[i + 1] + w[i] + w[i + 2:]
+    return w[:i] + rng.choice(ALPHABET.replace(w[i].lower(), "")) + w[i + 1:]
+
+
+def make_queries(corpus, n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = rng.sample(range(len(corpus)), min(n, len(corpus)))
+    out = []
+    for r in rows:
+        term = corpus.term(r).strip()
+        if not term:
+            continue
+        same = corpus.find_exact(term)
+        out.append({"kind": "term", "q": term, "rel": same})
+        variant = term.upper() if term != term.upper() else term.title()
+        if variant != term:
+            out.append({"kind": "casefold", "q": variant, "rel": same})
+        if len(term) >= 5 and term.isalpha():
+            typo = make_typo(term, rng)
+            if norm_term(typo) != norm_term(term):
+                out.append({"kind": "typo", "q": typo, "rel": same})
+        gloss = " ".join(gloss_of(corpus.text(r)).split()[:12])
+        if gloss and norm_term(gloss) != norm_term(term):
+            out.append({"kind": "gloss", "q": gloss, "rel": sorted(set(same) | {r})})
+    return out
+
+
+def run_mode(mode: str, queries: list[dict], k: int, warmup: int) -> dict:
+    for q in queries[:warmup]:  # load embedder / index / page in mmaps outside the timings
+        retrieve(q["q"], k=k, mode=mode)
+    lat, per_kind = [], {kind: {"n": 0, "hits": 0, "rr": 0.0} for kind in KINDS}
+    for q in queries:
+        t0 = time.perf_counter()
+        hits, _ = retrieve(q["q"], k=k, mode=mode)
+        lat.append((time.perf_counter() - t0) * 1000)
+        rel = set(q["rel"])
+        rank = next((i for i, h in enumerate(hits, 1) if h.row in rel), None)
+        st = per_kind[q["kind"]]
+        st["n"] += 1
+        if rank:
+            st["hits"] += 1
+            st["rr"] += 1.0 / rank
+    n = sum(st["n"] for st in per_kind.values()) or 1
+    res = {
+        f"recall@{k}": sum(st["hits"] for st in per_kind.values()) / n,
+        "mrr": sum(st["rr"] for st in per_kind.values()) / n,
+        "p50_ms": float(np.percentile(lat, 50)), "p95_ms": float(np.percentile(lat, 95)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "by_kind": {kind: {f"recall@{k}": st["hits"] / st["n"], "mrr": st["rr"] / st["n"], "n": st["n"]}
+                    for kind, st in per_kind.items() if st["n"]},
+    }
+    return res
+
+
+def print_report(results: dict, k: int):
+    rk = f"recall@{k}"
+    print(f"\n{'mode':<9} {'kind':<9} {rk:>9} {'MRR':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<9} {'ALL':<9} {r[rk]:>9.3f} {r['mrr']:>6.3f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+        for kind, kr in r["by_kind"].items():
+            print(f"{'':<9} {kind:<9} {kr[rk]:>9.3f} {kr['mrr']:>6.3f}   (n={kr['n']})")
+
+
+def compare(results: dict, baseline: dict, k: int, max_drop: float, max_slowdown: float,
+            min_slowdown_ms: float = 5.0) -> list[str]:
+    """Regressions vs baseline: quality drops beyond max_drop, p95 growth beyond max_slowdown×
+    that is also more than min_slowdown_ms (sub-ms lexical timings are mostly jitter)."""
+    rk, problems = f"recall@{k}", []
+    for mode, r in results.items():
+        b = baseline.get("results", {}).get(mode)
+        if not b:
+            continue
+        for metric in (rk, "mrr"):
+            if metric in b and r[metric] < b[metric] - max_drop:
+                problems.append(f"{mode}: {metric} {b[metric]:.3f} → {r[metric]:.3f}")
+        if r["p95_ms"] > b["p95_ms"] * max_slowdown and r["p95_ms"] - b["p95_ms"] > min_slowdown_ms:
+            problems.append(f"{mode}: p95 {b['p95_ms']:.1f}ms → {r['p95_ms']:.1f}ms")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Retrieval recall/MRR/latency benchmark")
+    ap.add_argument("--n", type=int, default=300, help="Number of corpus rows to derive queries from")
+    ap.add_argument("--k", type=int, default=4)
+    ap.add_argument("--modes", default=",".join(RETRIEVAL_MODES), help="e.g. hybrid,lexical,dense")
+    ap.add_argument("--seed", type=int, default=13)
+    ap.add_argument("--warmup", type=int, default=10)
+    ap.add_argument("--baseline", default=None, help="Compare against this baseline JSON")
+    ap.add_argument("--save-baseline", default=None, help="Write results as a new baseline JSON")
+    ap.add_argument("--max-drop", type=float, default=0.02, help="Allowed absolute recall/MRR drop")
+    ap.add_argument("--max-slowdown", type=float, default=1.5, help="Allowed p95 latency ratio")
+    ap.add_argument("--min-slowdown-ms", type=float, default=5.0,
+                    help="p95 growth below this many ms is never a regression, whatever the ratio")
+    args = ap.parse_args()
+
+    corpus = _load_corpus()
+    queries = make_queries(corpus, args.n, args.seed)
+    print(f"→ {len(queries)} queries from {min(args.n, len(corpus))} of {len(corpus):,} rows", file=sys.stderr)
+
+    results = {}
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        print(f"→ Running mode: {mode}", file=sys.stderr)
+        results[mode] = run_mode(mode, queries, args.k, args.warmup)
+    print_report(results, args.k)
+
+    if args.save_baseline:
+        out = Path(args.save_baseline)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps({"k": args.k, "n": args.n, "seed": args.seed, "results": results}, indent=2))
+        print(f"✅ Baseline saved: {out}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if (baseline.get("k"), baseline.get("n"), baseline.get("seed")) != (args.k, args.n, args.seed):
+            print("⚠️  Baseline was recorded with different --k/--n/--seed; numbers may not be comparable.", file=sys.stderr)
+        problems = compare(results, baseline, args.k, args.max_drop, args.max_slowdown, args.min_slowdown_ms)
+        if problems:
+            print("❌ Regressions vs baseline:\n- " + "\n- ".join(problems))
+            sys.exit(1)
+        print("✅ No regressions vs baseline")
+
+
+if __name__ == "__main__":
+    main()
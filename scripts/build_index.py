@@ -17,26 +17,51 @@ try:
 except Exception:
     pass
 
+import json, sys
 import numpy as np, pandas as pd
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
-CSV = Path("docs/entries.csv")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # allow `python scripts/build_index.py`
+from app.core.corpus import gloss_of, write_corpus
+from app.core.lexical import build_lexical
+
+# entries from scripts/wkt_to_entries.py: .csv (default) or .parquet, given as the first argument
+CSV = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("docs/entries.csv")
 IDX = Path("docs/index.faiss")
 PAR = Path("docs/entries.parquet")
+CORPUS = Path("docs/corpus")
+LEX = Path("docs/lexical")
 
 assert CSV.exists(), f"File not found: {CSV}"
 
-print("→ Reading CSV...")
-df = pd.read_csv(CSV)
-assert {"term","text"} <= set(df.columns), "CSV must have columns 'term' and 'text'"
+# structured columns written by wkt_to_entries.py (all optional; older CSVs only have term,text)
+LIST_FIELDS = ["glosses", "examples", "ipa", "forms"]
+DICT_FIELDS = ["lang", "pos"]
+
+def as_list(v) -> list[str]:
+    # CSV stores lists as JSON arrays (older files: "|"-joined forms); Parquet has native lists
+    if isinstance(v, str):
+        return json.loads(v) if v.startswith("[") else [x for x in v.split("|") if x]
+    if v is None or (isinstance(v, float) and np.isnan(v)):
+        return []
+    return [str(x) for x in v]
+
+print(f"→ Reading {CSV}...")
+df = pd.read_parquet(CSV) if CSV.suffix == ".parquet" else pd.read_csv(CSV, keep_default_na=False)
+assert {"term","text"} <= set(df.columns), "Entries must have columns 'term' and 'text'"
+list_fields = [c for c in df.columns if c in LIST_FIELDS or c.startswith("tr_")]
+for c in list_fields:
+    df[c] = df[c].map(as_list)
 texts = df["text"].astype(str).tolist()
+# embed the focused template text when the converter produced one
+emb_texts = df["embed_text"].astype(str).tolist() if "embed_text" in df.columns else texts
 
 print("→ Loading embedder...")
 embedder = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
 
-print(f"→ Building embeddings for {len(texts)} rows...")
-emb = embedder.encode(texts, normalize_embeddings=True, batch_size=32, show_progress_bar=True)
+print(f"→ Building embeddings for {len(emb_texts)} rows...")
+emb = embedder.encode(emb_texts, normalize_embeddings=True, batch_size=32, show_progress_bar=True)
 emb = np.asarray(emb, dtype="float32")
 
 print("→ Creating FAISS index (cosine via inner product)...")
@@ -52,4 +77,17 @@ faiss.write_index(index, str(IDX))
 print(f"→ Saving data: {PAR}")
 df.to_parquet(PAR, index=False)
 
-print("✅ Done:", IDX, "and", PAR)
+print(f"→ Saving compact corpus: {CORPUS}")
+fields = {c: df[c].astype(str).tolist() for c in DICT_FIELDS if c in df.columns}
+fields.update({c: df[c].tolist() for c in list_fields if c != "forms"})
+write_corpus(CORPUS, df["term"].astype(str).tolist(), texts, fields, list_fields=list_fields)
+
+print(f"→ Building lexical index: {LEX}")
+if "glosses" in df.columns:
+    glosses = [" ".join(g) or gloss_of(t) for g, t in zip(df["glosses"], texts)]
+else:
+    glosses = [gloss_of(t) for t in texts]
+forms = df["forms"].tolist() if "forms" in df.columns else None
+build_lexical(LEX, df["term"].astype(str).tolist(), glosses, forms)
+
+print("✅ Done:", IDX, ",", PAR, ",", CORPUS, "and", LEX)
@@ -1,11 +1,23 @@
 # scripts/wkt_to_entries.py
-# Converts Wiktextract JSONL(.gz) -> docs/entries.csv with columns term,text
-# Supports: senses[*].glosses, senses[*].examples[{text}], top-level translations, sounds/ipa
+# Converts Wiktextract JSONL(.gz) -> docs/entries.csv (or .parquet) with structured columns:
+#   term, lang, pos, glosses, examples, ipa, forms, tr_<lc> (one per target language), text, embed_text
+# Supports: senses[*].glosses, senses[*].examples[{text}], top-level translations, sounds/ipa, forms
+#
+# List columns are JSON arrays in CSV; in Parquet they are native list<string> columns and
+# lang/pos are dictionary-encoded. `text` is the human-readable blob used as RAG context,
+# `embed_text` is built from --embed-template and is what build_index.py embeds.
+# JSON parsing runs in a process pool (--workers) while the main process writes.
 
-import argparse, csv, gzip, io, json, sys, textwrap
+import argparse, csv, gzip, io, json, os, sys, textwrap
+from itertools import islice
+from multiprocessing import Pool
 from pathlib import Path
 
 DEFAULT_LANGS = {"en", "uk", "pl"}
+DEFAULT_TARGETS = ("uk", "pl")
+# fields: term, lang, LANG, pos, gloss (first), glosses, examples, ipa, translations
+DEFAULT_EMBED_TEMPLATE = "{term} ({pos}): {glosses}"
+LIST_COLUMNS = ("glosses", "examples", "ipa", "forms")
 LANG_NAME_TO_CODE = {"english":"en", "ukrainian":"uk", "polish":"pl"}
 
 def norm_lc(obj):
@@ -27,7 +39,7 @@ def first_gloss(sense: dict) -> str | None:
                 return g.strip()
     return None
 
-def collect_examples(sense: dict, need=2):
+def collect_examples(sense: dict, need=None):
     out = []
     ex = sense.get("examples") or []
     for item in ex:
@@ -36,9 +48,8 @@ def collect_examples(sense: dict, need=2):
         else:
             t = item
         if isinstance(t, str) and t.strip():
-            # slightly shorten very long quotes
-            out.append(textwrap.shorten(t.strip().replace("\n"," "), width=220))
-            if len(out) >= need:
+            out.append(t.strip().replace("\n"," "))
+            if need and len(out) >= need:
                 break
     return out
 
@@ -50,21 +61,36 @@ def collect_ipa(obj: dict):
             vals.append(ipa.strip())
     return vals
 
-def collect_translations(obj: dict, targets={"uk","pl"}, limit=8):
-    # in your dump, "translations" are at the top level
-    trs = []
+def collect_translations(obj: dict, targets=DEFAULT_TARGETS, limit=None):
+    # in your dump, "translations" are at the top level; returns {lc: [words]}, at most `limit` per language
+    trs = {lc: [] for lc in targets}
     for tr in obj.get("translations") or []:
         if not isinstance(tr, dict):
             continue
         lc = (tr.get("lang_code") or "").strip().lower()
         w  = (tr.get("word") or "").strip()
-        if lc in targets and w:
-            trs.append(f"{lc}:{w}")
-            if len(trs) >= limit:
-                break
+        if lc in trs and w and w not in trs[lc] and (not limit or len(trs[lc]) < limit):
+            trs[lc].append(w)
     return trs
 
-def pack_row(obj, keep_langs):
+# forms with these tags are inflection-table metadata, not real word forms
+SKIP_FORM_TAGS = {"table-tags", "inflection-template", "class", "romanization"}
+
+def collect_forms(obj: dict, limit=40):
+    out = []
+    for f in obj.get("forms") or []:
+        if not isinstance(f, dict):
+            continue
+        w = (f.get("form") or "").strip()
+        if not w or w == "-" or SKIP_FORM_TAGS & set(f.get("tags") or []):
+            continue
+        if w not in out:
+            out.append(w)
+            if len(out) >= limit:
+                break
+    return out
+
+def pack_row(obj, keep_langs, targets=DEFAULT_TARGETS, embed_template=DEFAULT_EMBED_TEMPLATE):
     lc = norm_lc(obj)
     if keep_langs and keep_langs != {"any"} and lc not in keep_langs:
         return None
@@ -73,32 +99,113 @@ def pack_row(obj, keep_langs):
     if not term:
         return None
 
-    senses = obj.get("senses") or []
-    gloss = None
-    examples = []
-    for s in senses:
-        if not gloss:
-            gloss = first_gloss(s)
-        if len(examples) < 2:
-            examples += [e for e in collect_examples(s, need=2-len(examples)) if e]
-        if gloss and len(examples) >= 2:
-            break
-    if not gloss:
+    glosses, examples = [], []
+    for s in obj.get("senses") or []:
+        g = first_gloss(s)
+        if g and g not in glosses:
+            glosses.append(g)
+        examples += collect_examples(s)
+    if not glosses:
         return None
 
     ipa_list = collect_ipa(obj)
-    trs = collect_translations(obj) if lc == "en" else []
+    trs = collect_translations(obj, targets) if lc == "en" else {t: [] for t in targets}
+    tr_flat = [f"{t}:{w}" for t, ws in trs.items() for w in ws]
 
-    parts = [f"{(lc or '').upper()}: {gloss}"]
+    # structured columns keep everything; only text keeps the original compact shape
+    # (first gloss, 2 slightly shortened examples, 8 translations) for RAG prompts
+    short_ex = [textwrap.shorten(e, width=220) for e in examples[:2]]
+    parts = [f"{(lc or '').upper()}: {glosses[0]}"]
     if ipa_list:
         parts.append(f"IPA: /{', '.join(ipa_list)}/")
-    if examples:
-        parts.append("Examples:\n- " + "\n- ".join(examples))
-    if trs:
-        parts.append("Translations: " + ", ".join(trs))
-    text = " | ".join(parts)
+    if short_ex:
+        parts.append("Examples:\n- " + "\n- ".join(short_ex))
+    if tr_flat:
+        parts.append("Translations: " + ", ".join(tr_flat[:8]))
+
+    pos = (obj.get("pos") or "").strip()
+    embed_text = embed_template.format_map({
+        "term": term, "lang": lc, "LANG": lc.upper(), "pos": pos,
+        "gloss": glosses[0], "glosses": "; ".join(glosses), "examples": " ".join(short_ex),
+        "ipa": ", ".join(ipa_list), "translations": ", ".join(tr_flat),
+    })
+
+    row = {"term": term, "lang": lc, "pos": pos, "glosses": glosses, "examples": examples,
+           "ipa": ipa_list, "forms": collect_forms(obj)}
+    row.update({f"tr_{t}": ws for t, ws in trs.items()})
+    row["text"] = " | ".join(parts)
+    row["embed_text"] = embed_text
+    return row
+
+# --- parallel parsing: workers get the settings once via the pool initializer ---
+_CFG: dict = {}
 
-    return term, text
+def _init_worker(cfg: dict):
+    _CFG.update(cfg)
+
+def _parse_lines(lines: list[str]) -> tuple[int, list[dict]]:
+    seen, rows = 0, []
+    for line in lines:
+        try:
+            obj = json.loads(line)
+        except Exception:
+            continue
+        seen += 1
+        row = pack_row(obj, _CFG["keep_langs"], _CFG["targets"], _CFG["embed_template"])
+        if row:
+            rows.append(row)
+    return seen, rows
+
+def _chunks(fin, size: int):
+    while True:
+        batch = list(islice(fin, size))
+        if not batch:
+            return
+        yield batch
+
+class CsvSink:
+    def __init__(self, path: Path, columns: list[str]):
+        self.f = open(path, "w", newline="", encoding="utf-8")
+        self.columns = columns
+        self.w = csv.writer(self.f)
+        self.w.writerow(columns)
+
+    def write(self, rows: list[dict]):
+        for r in rows:
+            self.w.writerow([json.dumps(r[c], ensure_ascii=False) if isinstance(r[c], list) else r[c]
+                             for c in self.columns])
+
+    def close(self):
+        self.f.close()
+
+class ParquetSink:
+    """list<string> for list columns, dictionary-encoded lang/pos; one row group per batch."""
+
+    def __init__(self, path: Path, columns: list[str]):
+        try:
+            import pyarrow as pa, pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("❌ Parquet output needs pyarrow (poetry add pyarrow) — or use a .csv --out")
+        self.pa = pa
+        self.columns = columns
+        fields = []
+        for c in columns:
+            if c in LIST_COLUMNS or c.startswith("tr_"):
+                fields.append(pa.field(c, pa.list_(pa.string())))
+            elif c in ("lang", "pos"):
+                fields.append(pa.field(c, pa.dictionary(pa.int16(), pa.string())))
+            else:
+                fields.append(pa.field(c, pa.string()))
+        self.schema = pa.schema(fields)
+        self.w = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows: list[dict]):
+        if rows:
+            self.w.write_table(self.pa.Table.from_pylist([{c: r[c] for c in self.columns} for r in rows],
+                                                          schema=self.schema))
+
+    def close(self):
+        self.w.close()
 
 def open_maybe_gz(p: Path):
     if p.suffix == ".gz":
@@ -113,38 +220,48 @@ def open_maybe_gz(p: Path):
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="inp", default="data/raw/wiktextract.jsonl.gz")
-    ap.add_argument("--out", dest="out", default="docs/entries.csv")
+    ap.add_argument("--out", dest="out", default="docs/entries.csv", help=".csv or .parquet")
     ap.add_argument("--langs", default="en,uk,pl", help="e.g. en,uk,pl or any")
+    ap.add_argument("--targets", default=",".join(DEFAULT_TARGETS), help="Translation languages to keep")
+    ap.add_argument("--embed-template", default=DEFAULT_EMBED_TEMPLATE,
+                    help="Text that gets embedded; fields: term, lang, LANG, pos, gloss, glosses, examples, ipa, translations")
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    ap.add_argument("--batch", type=int, default=2000, help="Lines per worker task")
     ap.add_argument("--limit", type=int, default=0)
     args = ap.parse_args()
 
     keep_langs = set(x.strip().lower() for x in args.langs.split(",")) if args.langs else set(DEFAULT_LANGS)
     if keep_langs == {""}:
         keep_langs = set(DEFAULT_LANGS)
+    targets = tuple(x.strip().lower() for x in args.targets.split(",") if x.strip())
 
     inp = Path(args.inp); out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
     assert inp.exists(), f"File not found: {inp}"
 
+    columns = ["term", "lang", "pos", "glosses", "examples", "ipa", "forms",
+               *[f"tr_{t}" for t in targets], "text", "embed_text"]
+    cfg = {"keep_langs": keep_langs, "targets": targets, "embed_template": args.embed_template}
+    sink = ParquetSink(out, columns) if out.suffix == ".parquet" else CsvSink(out, columns)
+
     seen = written = 0
-    print(f"→ Reading {inp} and writing to {out} …", file=sys.stderr)
-    with open_maybe_gz(inp) as fin, open(out, "w", newline="", encoding="utf-8") as fout:
-        w = csv.writer(fout)
-        w.writerow(["term","text"])
-        for i, line in enumerate(fin, 1):
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            seen += 1
-            row = pack_row(obj, keep_langs)
-            if row:
-                w.writerow(row)
-                written += 1
+    report_every = max(1, 200_000 // args.batch)
+    print(f"→ Reading {inp} and writing to {out} ({args.workers} workers) …", file=sys.stderr)
+    with open_maybe_gz(inp) as fin, Pool(args.workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+        try:
+            # imap keeps input order and overlaps parsing in workers with writing here
+            for b, (n_seen, rows) in enumerate(pool.imap(_parse_lines, _chunks(fin, args.batch)), 1):
+                seen += n_seen
+                if args.limit:
+                    rows = rows[:args.limit - written]
+                sink.write(rows)
+                written += len(rows)
                 if args.limit and written >= args.limit:
                     break
-            if i % 200_000 == 0:
-                print(f"… processed: {i:,}, written: {written:,}", file=sys.stderr)
+                if b % report_every == 0:
+                    print(f"… processed: {seen:,}, written: {written:,}", file=sys.stderr)
+        finally:
+            sink.close()
     print(f"✅ Done. Read: {seen:,}, written: {written:,}", file=sys.stderr)
 
 if __name__ == "__main__":
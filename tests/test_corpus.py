@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from app.core import corpus
+
+
+@pytest.fixture
+def legacy(tmp_path, monkeypatch):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    parquet = tmp_path / "entries.parquet"
+    pd.DataFrame({"term": ["run", "cat"], "text": ["EN: to move quickly", "EN: feline"]}).to_parquet(parquet)
+    monkeypatch.setattr(corpus, "DEFAULT_PATH", tmp_path / "corpus")
+    monkeypatch.setattr(corpus, "LEGACY_PARQUET", parquet)
+    corpus.load_corpus.cache_clear()
+    yield tmp_path
+    corpus.load_corpus.cache_clear()
+
+
+def test_migrates_legacy_parquet(legacy):
+    c = corpus.load_corpus()
+    assert len(c) == 2 and c.find_exact("CAT") == [1]
+    # nothing but the finished corpus is left behind
+    assert sorted(p.name for p in legacy.iterdir()) == ["corpus", "entries.parquet"]
+
+
+def test_partial_corpus_is_rebuilt(legacy):
+    partial = legacy / "corpus"
+    partial.mkdir()
+    (partial / "term.off.npy").write_bytes(b"truncated")  # crashed before meta.json
+    assert corpus.load_corpus().term(0) == "run"
+
+
+def test_concurrent_first_loads_migrate_once(legacy, monkeypatch):
+    calls, write = [], corpus.write_corpus
+    monkeypatch.setattr(corpus, "write_corpus", lambda *a, **kw: calls.append(1) or write(*a, **kw))
+    barrier, out = threading.Barrier(4), []
+
+    def load():
+        barrier.wait()
+        out.append(len(corpus.load_corpus.__wrapped__()))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert out == [2, 2, 2, 2] and len(calls) == 1
+
+
+def test_rewrite_replaces_existing_corpus(tmp_path):
+    path = corpus.write_corpus(tmp_path / "corpus", ["a"], ["EN: a"])
+    corpus.write_corpus(path, ["b", "c"], ["EN: b", "EN: c"])
+    assert [corpus.Corpus(path).term(i) for i in range(2)] == ["b", "c"]
+    assert [p.name for p in tmp_path.iterdir()] == ["corpus"]
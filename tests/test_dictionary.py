@@ -0,0 +1,59 @@
+import pytest
+
+from app.core import corpus, lexical
+from app.core.dictionary import format_translation, lookup_translation
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    # "ran" has its own form-of entry without translations, like in Wiktextract dumps
+    terms = ["run", "ran", "cat", "кіт"]
+    texts = ["EN: to move quickly", "EN: simple past of run", "EN: feline", "UK: cat"]
+    fields = {
+        "lang": ["en", "en", "en", "uk"],
+        "pos": ["verb", "verb", "noun", "noun"],
+        "glosses": [["to move quickly"], ["simple past of run"], ["feline"], ["cat"]],
+        "ipa": [["/ɹʌn/"], [], ["/kæt/"], []],
+        "tr_uk": [["бігти"], [], ["кіт"], []],
+    }
+    path = corpus.write_corpus(tmp_path / "corpus", terms, texts, fields, list_fields=["glosses", "ipa", "tr_uk"])
+    lexical.build_lexical(tmp_path / "lexical", terms, [t.split(": ")[1] for t in texts],
+                          [["runs", "ran"], [], ["cats"], []])
+    monkeypatch.setattr(corpus, "DEFAULT_PATH", path)
+    monkeypatch.setattr(lexical, "DEFAULT_PATH", tmp_path / "lexical")
+    corpus.load_corpus.cache_clear(); lexical.load_lexical.cache_clear()
+    yield
+    corpus.load_corpus.cache_clear(); lexical.load_lexical.cache_clear()
+
+
+def test_exact_term(docs):
+    senses = lookup_translation("Cat", "en", "uk")
+    assert [(s.term, s.translations) for s in senses] == [("cat", ["кіт"])]
+    assert "**cat** /kæt/ — EN→UK" in format_translation("Cat", "en", "uk", senses)
+
+
+def test_form_of_entry_without_translations_falls_back_to_lemma(docs):
+    senses = lookup_translation("ran", "en", "uk")
+    assert [(s.term, s.translations) for s in senses] == [("run", ["бігти"])]
+
+
+def test_inflected_form_without_own_entry(docs):
+    assert lookup_translation("cats", "EN", "UK")[0].term == "cat"
+
+
+def test_unknown_or_other_language_returns_none(docs):
+    assert lookup_translation("zzz", "en", "uk") is None
+    assert lookup_translation("кіт", "uk", "en") is None
+    assert lookup_translation("cat", "en", "pl") is None
+
+
+def test_unreadable_corpus_returns_none(tmp_path, monkeypatch):
+    broken = tmp_path / "corpus"
+    broken.mkdir()
+    (broken / "meta.json").write_text("{}")  # complete marker but no columns
+    monkeypatch.setattr(corpus, "DEFAULT_PATH", broken)
+    corpus.load_corpus.cache_clear()
+    try:
+        assert lookup_translation("cat", "en", "uk") is None
+    finally:
+        corpus.load_corpus.cache_clear()
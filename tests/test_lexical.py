@@ -0,0 +1,37 @@
+import pytest
+
+from app.core.corpus import Corpus, write_corpus
+from app.core.lexical import BM25_MAX, FORM_SCORE, LEXICAL_CONFIDENT, LexicalIndex, build_lexical
+
+TERMS = ["run", "serendipity", "cat", "category", "dog"]
+GLOSSES = ["to move quickly on foot", "a fortunate discovery by chance", "small domesticated feline",
+           "a class of things", "domesticated canine"]
+FORMS = [["runs", "ran"], [], ["cats"], [], ["dogs"]]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    root = tmp_path_factory.mktemp("docs")
+    write_corpus(root / "corpus", TERMS, GLOSSES)
+    build_lexical(root / "lexical", TERMS, GLOSSES, FORMS)
+    return Corpus(root / "corpus"), LexicalIndex(root / "lexical")
+
+
+def test_inflected_form_maps_to_lemma(index):
+    corpus, lex = index
+    assert lex.search("Ran", corpus) == {0: FORM_SCORE}
+
+
+def test_typo_is_confident(index):
+    corpus, lex = index
+    scores = lex.search("serendipty", corpus)
+    assert max(scores, key=scores.get) == 1
+    assert scores[1] >= LEXICAL_CONFIDENT
+
+
+def test_bag_of_words_match_is_never_confident(index):
+    corpus, lex = index
+    scores = lex.search("fortunate discovery by chance", corpus)
+    assert max(scores, key=scores.get) == 1
+    assert BM25_MAX < LEXICAL_CONFIDENT
+    assert max(scores.values()) < LEXICAL_CONFIDENT
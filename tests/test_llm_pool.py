@@ -0,0 +1,242 @@
+import json, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core import llm_pool
+from app.core.llm_pool import Backend, BackendUnavailable, LLMPool, parse_backends
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def stub_backend(name, max_concurrency=2, delay=0.0, fail=None, calls=None):
+    """Backend whose request is served locally; fail() may return an exception to raise."""
+    b = Backend("ollama", name, max_concurrency=max_concurrency)
+
+    def once(model, messages, options, keep_alive=None):
+        if calls is not None:
+            calls.append(name)
+        err = fail() if fail else None
+        if err:
+            raise err
+        time.sleep(delay)
+        return name
+
+    b._chat_once = once
+    return b
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(llm_pool, "MAX_TRIES", 1)
+
+
+def test_parse_backends():
+    bs = parse_backends("ollama=http://a:11434#3, http://b:11434,openai=http://c:8000/v1")
+    assert [(b.kind, b.host, b.max_concurrency) for b in bs] == [
+        ("ollama", "http://a:11434", 3),
+        ("ollama", "http://b:11434", llm_pool.DEFAULT_CONCURRENCY),
+        ("openai", "http://c:8000/v1", llm_pool.DEFAULT_CONCURRENCY),
+    ]
+    assert parse_backends(" , ") == []
+    with pytest.raises(ValueError):
+        parse_backends("grpc=http://x")
+
+
+def test_simultaneous_requests_spread_by_load():
+    calls = []
+    pool = LLMPool([stub_backend("A", 2, delay=0.3, calls=calls), stub_backend("B", 4, delay=0.3, calls=calls)])
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=pool.chat, args=("m", [])) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(calls) == ["A"] * 2 + ["B"] * 4
+    assert time.perf_counter() - t0 < 0.55
+    assert all(b.in_flight == 0 for b in pool.backends)
+
+
+def test_chat_many_uses_every_backend():
+    calls = []
+    pool = LLMPool([stub_backend("A", 1, delay=0.05, calls=calls), stub_backend("B", 1, delay=0.05, calls=calls)])
+    assert len(pool.chat_many("m", [[]] * 4)) == 4
+    assert set(calls) == {"A", "B"}
+
+
+def test_failover_when_backend_down():
+    a = stub_backend("A", fail=lambda: ConnectionError("refused"))
+    pool = LLMPool([a, stub_backend("B")])
+    assert pool.chat("m", []) == "B"
+    assert not a.healthy() and a.failures == 1
+
+
+def test_client_error_fails_over_without_marking_down():
+    a = stub_backend("A", fail=lambda: StatusError(404))
+    pool = LLMPool([a, stub_backend("B")])
+    assert pool.chat("m", []) == "B"
+    assert a.healthy() and a.failures == 0
+
+
+def test_all_backends_failing_raises():
+    pool = LLMPool([stub_backend("A", fail=lambda: StatusError(500)),
+                    stub_backend("B", fail=lambda: TimeoutError("slow"))])
+    with pytest.raises(BackendUnavailable, match="All LLM backends failed") as exc:
+        pool.chat("m", [])
+    assert "HTTP 500" in str(exc.value) and "slow" in str(exc.value)
+
+
+def test_cooldown_recovery(monkeypatch):
+    monkeypatch.setattr(llm_pool, "FAIL_COOLDOWN", 0.1)
+    broken = {"on": True}
+    calls = []
+    a = stub_backend("A", fail=lambda: ConnectionError("down") if broken["on"] else None, calls=calls)
+    pool = LLMPool([a, stub_backend("B", calls=calls)])
+
+    assert pool.chat("m", []) == "B"          # A fails, B answers
+    calls.clear()
+    assert pool.chat("m", []) == "B"          # A is cooling down and not even tried
+    assert calls == ["B"]
+
+    broken["on"] = False
+    time.sleep(0.15)
+    assert a.healthy()
+    calls.clear()
+    assert pool.chat("m", []) == "A"          # back in rotation (both idle, A listed first)
+    assert a.failures == 0
+
+
+def test_keep_alive_numbers_are_sent_as_numbers():
+    assert llm_pool.normalize_keep_alive("-1") == -1
+    assert llm_pool.normalize_keep_alive("300") == 300
+    assert llm_pool.normalize_keep_alive("1.5") == 1.5
+    assert llm_pool.normalize_keep_alive("15m") == "15m"
+    assert llm_pool.normalize_keep_alive(0) == 0
+
+    sent = {}
+
+    class FakeClient:
+        def chat(self, **kw):
+            sent.update(kw)
+            return {"message": {"content": "ok"}}
+
+    b = Backend("ollama", "A")
+    b._client = FakeClient()
+    assert LLMPool([b], keep_alive="-1").chat("m", []) == "ok"
+    assert sent["keep_alive"] == -1
+
+
+def test_unload_reports_failed_backends():
+    unloaded = []
+    ok, bad = Backend("ollama", "A"), Backend("ollama", "B")
+    ok.unload = lambda model: unloaded.append(model)
+
+    def refuse(model):
+        raise ConnectionError("refused")
+
+    bad.unload = refuse
+    with pytest.raises(BackendUnavailable, match="B: refused"):
+        LLMPool([ok, bad]).unload("m")
+    assert unloaded == ["m"]
+
+
+def test_unload_ignores_hosts_without_the_model():
+    missing, broken = Backend("ollama", "A"), Backend("ollama", "B")
+
+    def not_found(model):
+        raise StatusError(404)
+
+    def server_error(model):
+        raise StatusError(500)
+
+    missing.unload = not_found
+    LLMPool([missing]).unload("m")  # nothing to unload is not a failure
+    broken.unload = server_error
+    with pytest.raises(BackendUnavailable, match="B: HTTP 500") as exc:
+        LLMPool([missing, broken]).unload("m")
+    assert "A:" not in str(exc.value)
+
+
+# --- real ollama / openai clients against a local stand-in server ---
+class _StandIn(BaseHTTPRequestHandler):
+    """Answers /api/chat (Ollama) and /v1/chat/completions (OpenAI) with the server's status."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.hits += 1
+        status, name = self.server.status, self.server.name
+        if status != 200:
+            body = {"error": f"status {status}"}
+        elif self.path == "/api/chat":
+            body = {"model": "m", "created_at": "2024-01-01T00:00:00Z", "done": True,
+                    "message": {"role": "assistant", "content": name}}
+        else:
+            body = {"id": "x", "object": "chat.completion", "created": 0, "model": "m",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": name}}]}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(name, status):
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        srv.name, srv.status, srv.hits = name, status, 0
+        threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(srv)
+        return srv
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+def http_backend(kind, srv):
+    pytest.importorskip(kind)
+    url = f"http://127.0.0.1:{srv.server_port}" + ("/v1" if kind == "openai" else "")
+    return Backend(kind, url, timeout=5)
+
+
+@pytest.mark.parametrize("kind", ["ollama", "openai"])
+def test_real_client_fails_over_on_server_error(stand_in, kind):
+    down, up = stand_in("A", 500), stand_in("B", 200)
+    a, b = http_backend(kind, down), http_backend(kind, up)
+    pool = LLMPool([a, b])
+    assert pool.chat("m", [{"role": "user", "content": "hi"}]) == "B"
+    assert down.hits == 1 and up.hits == 1
+    assert not a.healthy() and b.healthy()
+    assert pool.chat("m", []) == "B" and down.hits == 1  # A is cooling down
+
+
+@pytest.mark.parametrize("kind", ["ollama", "openai"])
+def test_real_client_404_fails_over_without_cooldown(stand_in, kind):
+    missing, up = stand_in("A", 404), stand_in("B", 200)
+    a = http_backend(kind, missing)
+    pool = LLMPool([a, http_backend(kind, up)])
+    assert pool.chat("m", []) == "B"
+    assert a.down_until == 0.0 and a.healthy()
+    missing.status = 200
+    assert pool.chat("m", []) == "A"
+
+
+@pytest.mark.parametrize("kind", ["ollama", "openai"])
+def test_real_client_all_failing(stand_in, kind):
+    pool = LLMPool([http_backend(kind, stand_in("A", 500)), http_backend(kind, stand_in("B", 404))])
+    with pytest.raises(BackendUnavailable, match="All LLM backends failed"):
+        pool.chat("m", [])
+    assert [b.healthy() for b in pool.backends] == [False, True]